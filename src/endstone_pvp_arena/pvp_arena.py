@@ -1,5 +1,10 @@
+import functools
+import heapq
+import operator
 import uuid
+from math import pow as _pow
 
+from endstone import Logger
 from endstone.event import (
     ActorDeathEvent,
     PlayerDeathEvent,
@@ -14,6 +19,9 @@ from endstone.scoreboard import Criteria
 from endstone.inventory import ItemStack
 from endstone.boss import BarColor, BarStyle, BossBar
 
+# Enabled plugin instance, used by the static event handlers
+_PLUGIN_REF: "PvPArena | None" = None
+
 
 class PvPArena(Plugin):
     api_version = "0.8"
@@ -52,12 +60,22 @@ class PvPArena(Plugin):
         super().__init__()
         # Use player names for pending requests
         self._pending: dict[str, list[str]] = {}
-        # Track duel state by player UUID so entries persist across deaths
-        self._duels: dict[uuid.UUID, uuid.UUID] = {}
+        # Track duel state by player UUID so entries persist across deaths.
+        # _opponent maps both directions for O(1) lookups from either duelist,
+        # _active_duels holds one entry per duel for counting.
+        self._opponent: dict[uuid.UUID, uuid.UUID] = {}
+        self._active_duels: set[frozenset[uuid.UUID]] = set()
         # Store each player's inventory and offhand item while dueling
         self._inventories: dict[uuid.UUID, dict[str, list | ItemStack | None]] = {}
         self._locations: dict[uuid.UUID, Location] = {}
         self._bars: dict[uuid.UUID, BossBar] = {}
+        # Scoreboard objectives resolved once in on_enable; they are never
+        # removed while the plugin is running, so the handles stay valid.
+        self._wins_obj = None
+        self._elo_obj = None
+        # Arena teleport target, resolved lazily since the level may not be
+        # loaded yet when the plugin is enabled
+        self._arena_loc: Location | None = None
 
     def _set_keep_inventory(self, value: bool) -> None:
         """Toggle the keepinventory gamerule via console command."""
@@ -70,32 +88,40 @@ class PvPArena(Plugin):
             self.logger.error(f"Failed to set keepinventory: {exc}")
 
     def on_enable(self) -> None:
+        global _PLUGIN_REF
         sb = self.server.scoreboard
         if not sb.get_objective("pvp_wins"):
             sb.add_objective("pvp_wins", Criteria.Type.DUMMY, "PvP Wins")
         if not sb.get_objective("elo_rating"):
             sb.add_objective("elo_rating", Criteria.Type.DUMMY, "ELO Rating")
+        self._wins_obj = sb.get_objective("pvp_wins")
+        self._elo_obj = sb.get_objective("elo_rating")
+        _PLUGIN_REF = self
         self.register_events(self)
         self.logger.info("PvP Arena events registered")
 
+    def on_disable(self) -> None:
+        global _PLUGIN_REF
+        if _PLUGIN_REF is self:
+            _PLUGIN_REF = None
+
     # Menu helpers
     def _show_main_menu(self, player) -> None:
         form = ActionForm("PvP Menu")
         form.add_button("Challenge Player")
         form.add_button("Pending Requests")
         form.add_button("Leaderboards")
-
-        def handle(p, index):
-            if index == 0:
-                self._show_player_list(p)
-            elif index == 1:
-                self._show_pending(p)
-            else:
-                self._show_leaderboards(p)
-
-        form.on_submit = handle
+        form.on_submit = self._handle_main_menu_submit
         player.send_form(form)
 
+    def _handle_main_menu_submit(self, p, index) -> None:
+        if index == 0:
+            self._show_player_list(p)
+        elif index == 1:
+            self._show_pending(p)
+        else:
+            self._show_leaderboards(p)
+
     def _show_player_list(self, player) -> None:
         others = [p for p in self.server.online_players if p != player]
         form = ActionForm("Select Opponent")
@@ -104,91 +130,98 @@ class PvPArena(Plugin):
         for o in others:
             elo = self._get_elo(o)
             form.add_button(f"{o.name} ({elo})")
-
-        def handle(p, index):
-            if 0 <= index < len(others):
-                target = others[index]
-                self._pending.setdefault(target.name, []).append(p.name)
-                p.send_tip(f"Duel request sent to {target.name}")
-                target.send_tip(f"{p.name} challenged you. Use /pvp to respond.")
-
-        form.on_submit = handle
+        form.on_submit = functools.partial(self._handle_player_list_submit, others)
         player.send_form(form)
 
+    def _handle_player_list_submit(self, others, p, index) -> None:
+        if 0 <= index < len(others):
+            target = others[index]
+            self._pending.setdefault(target.name, []).append(p.name)
+            p.send_tip(f"Duel request sent to {target.name}")
+            target.send_tip(f"{p.name} challenged you. Use /pvp to respond.")
+
     def _show_pending(self, player) -> None:
-        requests = [self.server.get_player(name) for name in self._pending.get(player.name, [])]
-        requests = [r for r in requests if r]
+        online = {p.name: p for p in self.server.online_players}
+        # Keep each challenger's position in the pending list so it can be popped directly
+        requests = [
+            (idx, online[name])
+            for idx, name in enumerate(self._pending.get(player.name, []))
+            if name in online
+        ]
         form = ActionForm("Pending Requests")
         if not requests:
             form.content = "No pending requests"
-        for r in requests:
+        for _, r in requests:
             form.add_button(r.name)
-
-        def handle(p, index):
-            if 0 <= index < len(requests):
-                challenger = requests[index]
-                self._pending[player.name].remove(challenger.name)
-                self._start_duel(challenger, p)
-
-        form.on_submit = handle
+        form.on_submit = functools.partial(self._handle_pending_submit, requests)
         player.send_form(form)
 
+    def _handle_pending_submit(self, requests, p, index) -> None:
+        if 0 <= index < len(requests):
+            orig_idx, challenger = requests[index]
+            pending = self._pending[p.name]
+            if orig_idx < len(pending) and pending[orig_idx] == challenger.name:
+                pending.pop(orig_idx)
+            elif challenger.name in pending:
+                # The list changed while the form was open
+                pending.remove(challenger.name)
+            else:
+                # Already accepted from another open form
+                return
+            self._start_duel(challenger, p)
+
     def _show_leaderboards(self, player) -> None:
         form = ActionForm("Leaderboards")
         form.add_button("ELO Rating")
         form.add_button("Win Count")
+        form.on_submit = self._handle_leaderboards_submit
+        player.send_form(form)
 
-        def handle(p, index):
-            if index == 0:
-                self._show_elo_leaderboard(p)
-            elif index == 1:
-                self._show_wins_leaderboard(p)
+    def _handle_leaderboards_submit(self, p, index) -> None:
+        if index == 0:
+            self._show_elo_leaderboard(p)
+        elif index == 1:
+            self._show_wins_leaderboard(p)
 
-        form.on_submit = handle
+    def _top_scores(self, obj, k: int = 10) -> list[tuple[str, int]]:
+        """Return the ``k`` highest set scores for an objective as (name, value)."""
+
+        def iter_scores():
+            get = obj.get_score
+            for entry in obj.scoreboard.entries:
+                score = get(entry)
+                if score.is_score_set:
+                    yield (entry.name if hasattr(entry, "name") else str(entry), score.value)
+
+        return heapq.nlargest(k, iter_scores(), key=operator.itemgetter(1))
+
+    def _send_leaderboard(self, player, title: str, obj) -> None:
+        top = self._top_scores(obj)
+        form = ActionForm(title)
+        form.content = "\n".join(f"{name}: {score}" for name, score in top) if top else "No scores"
         player.send_form(form)
 
     def _show_wins_leaderboard(self, player) -> None:
-        obj = self.server.scoreboard.get_objective("pvp_wins")
-        scores = []
-        for entry in obj.scoreboard.entries:
-            score = obj.get_score(entry)
-            if score.is_score_set:
-                name = entry.name if hasattr(entry, "name") else str(entry)
-                scores.append((name, score.value))
-        scores.sort(key=lambda t: t[1], reverse=True)
-        form = ActionForm("Win Leaderboard")
-        content = "\n".join(f"{name}: {score}" for name, score in scores[:10]) or "No scores"
-        form.content = content
-        player.send_form(form)
+        self._send_leaderboard(player, "Win Leaderboard", self._wins_obj)
 
     def _show_elo_leaderboard(self, player) -> None:
-        obj = self.server.scoreboard.get_objective("elo_rating")
-        scores = []
-        for entry in obj.scoreboard.entries:
-            score = obj.get_score(entry)
-            if score.is_score_set:
-                name = entry.name if hasattr(entry, "name") else str(entry)
-                scores.append((name, score.value))
-        scores.sort(key=lambda t: t[1], reverse=True)
-        form = ActionForm("ELO Leaderboard")
-        content = "\n".join(f"{name}: {score}" for name, score in scores[:10]) or "No scores"
-        form.content = content
-        player.send_form(form)
+        self._send_leaderboard(player, "ELO Leaderboard", self._elo_obj)
 
     def _arena_location(self) -> Location:
-        level = self.server.level
-        dim = level.get_dimension(self.ARENA_DIMENSION)
-        return Location(dim, self.ARENA_X, self.ARENA_Y, self.ARENA_Z)
+        if self._arena_loc is None:
+            dim = self.server.level.get_dimension(self.ARENA_DIMENSION)
+            self._arena_loc = Location(dim, self.ARENA_X, self.ARENA_Y, self.ARENA_Z)
+        return self._arena_loc
 
     def _get_elo(self, entry) -> int:
-        obj = self.server.scoreboard.get_objective("elo_rating")
+        obj = self._elo_obj
         score = obj.get_score(entry)
         if not score.is_score_set:
             score.value = 1000
         return score.value
 
     def _update_elo(self, winner, loser) -> None:
-        obj = self.server.scoreboard.get_objective("elo_rating")
+        obj = self._elo_obj
         w_score = obj.get_score(winner)
         l_score = obj.get_score(loser)
         if not w_score.is_score_set:
@@ -197,13 +230,11 @@ class PvPArena(Plugin):
             l_score.value = 1000
         w_old = w_score.value
         l_old = l_score.value
-        expected_w = 1 / (1 + 10 ** ((l_old - w_old) / 400))
-        expected_l = 1 - expected_w
-        k = 32
-        w_new = round(w_old + k * (1 - expected_w))
-        l_new = round(l_old + k * (0 - expected_l))
-        w_score.value = int(w_new)
-        l_score.value = int(l_new)
+        # Elo is zero-sum: the loser drops exactly what the winner gains
+        expected_w = 1.0 / (1.0 + _pow(10.0, (l_old - w_old) / 400.0))
+        delta = round(32.0 * (1.0 - expected_w))
+        w_score.value = int(w_old + delta)
+        l_score.value = int(l_old - delta)
 
     def _clone_inventory(self, player) -> dict:
         """Return a deep copy of the player's inventory, including offhand."""
@@ -230,24 +261,31 @@ class PvPArena(Plugin):
     def _restore_inventory(self, player) -> None:
         inv = self._inventories.get(player.unique_id)
         if inv is not None:
-            player.inventory.clear()
-            for idx, item in enumerate(inv.get("contents", [])):
-                if item is not None:
-                    player.inventory.set_item(idx, item)
+            inventory = player.inventory
+            contents = inv.get("contents", [])
+            try:
+                # Replace every slot in a single call where the API allows it
+                inventory.contents = contents
+            except (AttributeError, TypeError):
+                inventory.clear()
+                for idx, item in enumerate(contents):
+                    if item is not None:
+                        inventory.set_item(idx, item)
             off = inv.get("offhand")
             if off is not None:
-                player.inventory.item_in_off_hand = off
+                inventory.item_in_off_hand = off
 
     def _update_bar(self, p1, p2) -> None:
         """Create or update the boss bar showing the duel state."""
+        p1_id = p1.unique_id
         title = f"{p1.name} vs {p2.name}"
-        bar = self._bars.get(p1.unique_id)
+        bar = self._bars.get(p1_id)
         if not bar:
             bar = self.server.create_boss_bar(title, BarColor.RED, BarStyle.SOLID)
             bar.add_player(p1)
             bar.add_player(p2)
             bar.is_visible = True
-            self._bars[p1.unique_id] = bar
+            self._bars[p1_id] = bar
             self._bars[p2.unique_id] = bar
         else:
             bar.title = title
@@ -255,28 +293,35 @@ class PvPArena(Plugin):
 
     def _reset_round(self, p1, p2) -> None:
         """Teleport duelists to the arena and display the duel banner."""
-        self.logger.debug(
-            f"Starting duel between {p1.name} and {p2.name}"
-        )
+        p1_name = p1.name
+        p2_name = p2.name
+        if self.logger.is_enabled_for(Logger.DEBUG):
+            self.logger.debug(
+                f"Starting duel between {p1_name} and {p2_name}"
+            )
         loc = self._arena_location()
         for p in (p1, p2):
             self._restore_inventory(p)
             p.health = p.max_health
             p.teleport(loc)
 
-        vs = f"{p1.name} vs {p2.name}"
+        vs = f"{p1_name} vs {p2_name}"
         p1.send_title(vs, "Fight!")
         p2.send_title(vs, "Fight!")
         self._update_bar(p1, p2)
 
     def _start_duel(self, p1, p2) -> None:
-        self.logger.debug(f"Starting duel between {p1.name} and {p2.name}")
-        for p in (p1, p2):
-            self._inventories[p.unique_id] = self._clone_inventory(p)
-            self._locations[p.unique_id] = p.location
-        self._duels[p1.unique_id] = p2.unique_id
-        self._duels[p2.unique_id] = p1.unique_id
-        if len(self._duels) == 2:
+        p1_id = p1.unique_id
+        p2_id = p2.unique_id
+        if self.logger.is_enabled_for(Logger.DEBUG):
+            self.logger.debug(f"Starting duel between {p1.name} and {p2.name}")
+        for p, p_id in ((p1, p1_id), (p2, p2_id)):
+            self._inventories[p_id] = self._clone_inventory(p)
+            self._locations[p_id] = p.location
+        self._opponent[p1_id] = p2_id
+        self._opponent[p2_id] = p1_id
+        self._active_duels.add(frozenset((p1_id, p2_id)))
+        if len(self._active_duels) == 1:
             self._set_keep_inventory(True)
         self._reset_round(p1, p2)
 
@@ -285,33 +330,41 @@ class PvPArena(Plugin):
             self.logger.info("Cannot end duel: missing player instance")
             return
 
-        self.logger.debug(f"_end_duel called with winner={winner.name} loser={loser.name}")
-        self.logger.info(f"Ending duel: {winner.name} defeated {loser.name}")
+        w_id = winner.unique_id
+        l_id = loser.unique_id
+        w_name = winner.name
+        l_name = loser.name
+        debug = self.logger.is_enabled_for(Logger.DEBUG)
+
+        if debug:
+            self.logger.debug(f"_end_duel called with winner={w_name} loser={l_name}")
+        self.logger.info(f"Ending duel: {w_name} defeated {l_name}")
 
-        obj = self.server.scoreboard.get_objective("pvp_wins")
+        obj = self._wins_obj
         if hasattr(obj, "ensure_has_entry"):
             obj.ensure_has_entry(winner)
             obj.ensure_has_entry(loser)
         score = obj.get_score(winner)
         score.value = score.value + 1
         self.logger.info("Updated win count")
-        self.logger.debug(
-            f"Winner score now {score.value} for player {winner.name}"
-        )
+        if debug:
+            self.logger.debug(
+                f"Winner score now {score.value} for player {w_name}"
+            )
 
         self._update_elo(winner, loser)
         self.logger.info("Updated ELO scores")
-        w_elo = self._get_elo(winner)
-        l_elo = self._get_elo(loser)
-        self.logger.debug(
-            f"Winner elo={w_elo} loser elo={l_elo} after duel"
-        )
+        if debug:
+            w_elo = self._get_elo(winner)
+            l_elo = self._get_elo(loser)
+            self.logger.debug(
+                f"Winner elo={w_elo} loser elo={l_elo} after duel"
+            )
 
-        bar = self._bars.pop(winner.unique_id, None)
-        if not bar:
-            bar = self._bars.pop(loser.unique_id, None)
-        else:
-            self._bars.pop(loser.unique_id, None)
+        # Both duelists map to the same bar; pop both entries unconditionally
+        w_bar = self._bars.pop(w_id, None)
+        l_bar = self._bars.pop(l_id, None)
+        bar = w_bar or l_bar
         if bar:
             bar.remove_player(winner)
             bar.remove_player(loser)
@@ -322,12 +375,18 @@ class PvPArena(Plugin):
         else:
             self.logger.info("No boss bar to clear")
 
-        for p in (winner, loser):
+        restores = []
+        for p, p_id in ((winner, w_id), (loser, l_id)):
             self._restore_inventory(p)
-            self._inventories.pop(p.unique_id, None)
-            loc = self._locations.pop(p.unique_id, None)
-
-            def finish_restore(player=p, location=loc) -> None:
+            self._inventories.pop(p_id, None)
+            restores.append((p, self._locations.pop(p_id, None)))
+            self._opponent.pop(p_id, None)
+
+        def finish_restore(items=restores) -> None:
+            for player, location in items:
+                # Skip a duelist who disconnected during the delay
+                if not self.server.get_player(player.unique_id):
+                    continue
                 if location:
                     player.teleport(location)
                     self.logger.info(
@@ -335,68 +394,75 @@ class PvPArena(Plugin):
                     )
                 player.health = player.max_health
 
-            self.server.scheduler.run_task(self, finish_restore, delay=40)
-            self._duels.pop(p.unique_id, None)
+        self.server.scheduler.run_task(self, finish_restore, delay=40)
+        self._active_duels.discard(frozenset((w_id, l_id)))
 
         winner.send_title("Duel Won", "")
         loser.send_title("Duel Lost", "")
         self.server.broadcast_message(
-            f"{winner.name} defeated {loser.name} in a duel!"
+            f"{w_name} defeated {l_name} in a duel!"
         )
         self.logger.info("Duel ended and announcement broadcasted")
 
-        if not self._duels:
+        if not self._active_duels:
             self._set_keep_inventory(False)
 
     def _end_duel_disconnect(self, winner, loser_offline) -> None:
         """End a duel when the loser disconnected."""
+        w_id = winner.unique_id
         loser_id = loser_offline.unique_id
         loser_name = loser_offline.name
 
-        obj = self.server.scoreboard.get_objective("pvp_wins")
+        obj = self._wins_obj
         score = obj.get_score(winner)
         score.value = score.value + 1
 
-        self._update_elo(winner, loser_name)
+        # Score the quitting player's own entry; a bare name would be tracked as a
+        # separate fake-player entry and never match their online rating
+        self._update_elo(winner, loser_offline)
 
-        bar = self._bars.pop(winner.unique_id, None)
-        if not bar:
-            bar = self._bars.pop(loser_id, None)
+        w_bar = self._bars.pop(w_id, None)
+        l_bar = self._bars.pop(loser_id, None)
+        bar = w_bar or l_bar
         if bar:
             bar.remove_player(winner)
             bar.is_visible = False
             bar.remove_all()
 
         self._restore_inventory(winner)
-        self._inventories.pop(winner.unique_id, None)
-        loc = self._locations.pop(winner.unique_id, None)
+        self._inventories.pop(w_id, None)
+        loc = self._locations.pop(w_id, None)
         if loc:
             winner.teleport(loc)
         winner.health = winner.max_health
 
-        self._duels.pop(winner.unique_id, None)
-        self._duels.pop(loser_id, None)
+        self._opponent.pop(w_id, None)
+        self._opponent.pop(loser_id, None)
+        self._active_duels.discard(frozenset((w_id, loser_id)))
 
         self.server.broadcast_message(
             f"{winner.name} defeated {loser_name} in a duel (opponent disconnected)!"
         )
         self.logger.info("Duel ended due to disconnect")
 
-        if not self._duels:
+        if not self._active_duels:
             self._set_keep_inventory(False)
 
     def _retry_end_duel(self, win_id: uuid.UUID, los_id: uuid.UUID, remaining: int) -> None:
         """Try to end the duel, retrying if players aren't available."""
-        self.logger.debug(
-            f"_retry_end_duel called win_id={win_id} los_id={los_id} remaining={remaining}"
-        )
+        debug = self.logger.is_enabled_for(Logger.DEBUG)
+        if debug:
+            self.logger.debug(
+                f"_retry_end_duel called win_id={win_id} los_id={los_id} remaining={remaining}"
+            )
 
         def attempt() -> None:
             winner = self.server.get_player(win_id)
             loser = self.server.get_player(los_id)
-            self.logger.debug(
-                f"_retry_end_duel attempt winner={winner} loser={loser}"
-            )
+            if debug:
+                self.logger.debug(
+                    f"_retry_end_duel attempt winner={winner} loser={loser}"
+                )
             if winner and loser:
                 try:
                     self.logger.debug("Both players online, calling _end_duel")
@@ -404,9 +470,10 @@ class PvPArena(Plugin):
                 except Exception as exc:
                     self.logger.error(f"Failed to end duel: {exc}")
                     if remaining > 0:
-                        self.logger.debug(
-                            f"Retrying duel end in 2 ticks ({remaining} left)"
-                        )
+                        if debug:
+                            self.logger.debug(
+                                f"Retrying duel end in 2 ticks ({remaining} left)"
+                            )
                         self.server.scheduler.run_task(
                             self,
                             lambda: self._retry_end_duel(win_id, los_id, remaining - 1),
@@ -417,9 +484,10 @@ class PvPArena(Plugin):
                     f"Cannot end duel: players offline (winner={win_id}, loser={los_id})"
                 )
                 if remaining > 0:
-                    self.logger.debug(
-                        f"Players offline, retrying in 2 ticks ({remaining} left)"
-                    )
+                    if debug:
+                        self.logger.debug(
+                            f"Players offline, retrying in 2 ticks ({remaining} left)"
+                        )
                     self.server.scheduler.run_task(
                         self,
                         lambda: self._retry_end_duel(win_id, los_id, remaining - 1),
@@ -433,10 +501,10 @@ class PvPArena(Plugin):
     @event_handler
     def on_player_death(event: PlayerDeathEvent) -> None:
         """Handle a player's death during a duel."""
-        server = event.player.server
-        plugin = server.plugin_manager.get_plugin("pvp_arena")
-        if not isinstance(plugin, PvPArena):
+        plugin = _PLUGIN_REF
+        if plugin is None:
             return
+        server = event.player.server
         server.logger.info(f"PlayerDeathEvent captured for {event.player.name}")
         plugin._handle_player_death(event)
 
@@ -446,10 +514,10 @@ class PvPArena(Plugin):
         """Fallback handler in case PlayerDeathEvent is not fired."""
         if not getattr(event.actor, "is_player", False):
             return
-        server = event.actor.server
-        plugin = server.plugin_manager.get_plugin("pvp_arena")
-        if not isinstance(plugin, PvPArena):
+        plugin = _PLUGIN_REF
+        if plugin is None:
             return
+        server = event.actor.server
         server.logger.info(f"ActorDeathEvent captured for {event.actor.name}")
         if isinstance(event, PlayerDeathEvent):
             plugin._handle_player_death(event)
@@ -463,40 +531,44 @@ class PvPArena(Plugin):
     @staticmethod
     @event_handler
     def on_player_quit(event: PlayerQuitEvent) -> None:
-        server = event.player.server
-        plugin = server.plugin_manager.get_plugin("pvp_arena")
-        if isinstance(plugin, PvPArena):
+        plugin = _PLUGIN_REF
+        if plugin is not None:
             plugin._handle_player_quit(event)
 
     @staticmethod
     @event_handler
     def on_player_join(event: PlayerJoinEvent) -> None:
-        server = event.player.server
-        plugin = server.plugin_manager.get_plugin("pvp_arena")
-        if isinstance(plugin, PvPArena):
+        plugin = _PLUGIN_REF
+        if plugin is not None:
             plugin._handle_player_join(event.player)
 
     def _handle_player_death(self, event: PlayerDeathEvent) -> None:
+        debug = self.logger.is_enabled_for(Logger.DEBUG)
         self.logger.debug("_handle_player_death fired")
         killer = event.damage_source.actor
         victim = event.player
+        victim_name = victim.name
+        killer_name = getattr(killer, "name", "None")
         self.logger.info(
-            f"Death event: {victim.name} killed by {getattr(killer, 'name', 'None')}"
+            f"Death event: {victim_name} killed by {killer_name}"
         )
-        self.logger.debug(f"Current duels mapping: {self._duels}")
+        if debug:
+            self.logger.debug(f"Current duels mapping: {self._opponent}")
 
         killer_id = killer.unique_id if killer and getattr(killer, "is_player", False) else None
         victim_id = victim.unique_id
 
         if killer_id is not None:
-            opponent_id = self._duels.get(killer_id)
-            self.logger.debug(
-                f"Lookup duel: killer={killer_id} victim={victim_id} opponent={opponent_id}"
-            )
-            if opponent_id == victim_id:
+            opponent_id = self._opponent.get(killer_id)
+            if debug:
                 self.logger.debug(
-                    f"Duel over: {killer.name} defeated {victim.name}"
+                    f"Lookup duel: killer={killer_id} victim={victim_id} opponent={opponent_id}"
                 )
+            if opponent_id == victim_id:
+                if debug:
+                    self.logger.debug(
+                        f"Duel over: {killer_name} defeated {victim_name}"
+                    )
                 self.server.scheduler.run_task(
                     self,
                     lambda: self._retry_end_duel(killer_id, victim_id, 5),
@@ -508,10 +580,11 @@ class PvPArena(Plugin):
                 )
         else:
             # No killer (environmental death). Attempt to resolve duel if victim is in one
-            opponent_id = self._duels.get(victim_id)
-            self.logger.debug(
-                f"No killer found. victim_id={victim_id} opponent={opponent_id}"
-            )
+            opponent_id = self._opponent.get(victim_id)
+            if debug:
+                self.logger.debug(
+                    f"No killer found. victim_id={victim_id} opponent={opponent_id}"
+                )
             if opponent_id:
                 opponent = self.server.get_player(opponent_id)
                 if opponent:
@@ -530,28 +603,34 @@ class PvPArena(Plugin):
 
     def _handle_actor_death(self, event: ActorDeathEvent) -> None:
         """Fallback processing when only ActorDeathEvent is available."""
+        debug = self.logger.is_enabled_for(Logger.DEBUG)
         self.logger.debug("_handle_actor_death fired")
         killer = event.damage_source.actor if event.damage_source else None
         victim = event.actor
         if not getattr(victim, "is_player", False):
             return
+        victim_name = victim.name
+        killer_name = getattr(killer, "name", "None")
         self.logger.info(
-            f"Fallback death event: {victim.name} killed by {getattr(killer, 'name', 'None')}"
+            f"Fallback death event: {victim_name} killed by {killer_name}"
         )
-        self.logger.debug(f"Current duels mapping: {self._duels}")
+        if debug:
+            self.logger.debug(f"Current duels mapping: {self._opponent}")
 
         killer_id = killer.unique_id if killer and getattr(killer, "is_player", False) else None
         victim_id = victim.unique_id
 
         if killer_id is not None:
-            opponent_id = self._duels.get(killer_id)
-            self.logger.debug(
-                f"Lookup duel: killer={killer_id} victim={victim_id} opponent={opponent_id}"
-            )
-            if opponent_id == victim_id:
+            opponent_id = self._opponent.get(killer_id)
+            if debug:
                 self.logger.debug(
-                    f"Duel over: {killer.name} defeated {victim.name} (fallback)"
+                    f"Lookup duel: killer={killer_id} victim={victim_id} opponent={opponent_id}"
                 )
+            if opponent_id == victim_id:
+                if debug:
+                    self.logger.debug(
+                        f"Duel over: {killer_name} defeated {victim_name} (fallback)"
+                    )
                 self.server.scheduler.run_task(
                     self,
                     lambda: self._retry_end_duel(killer_id, victim_id, 5),
@@ -562,10 +641,11 @@ class PvPArena(Plugin):
                     f"Duel state mismatch for kill: killer={killer_id} victim={victim_id} opponent={opponent_id}"
                 )
         else:
-            opponent_id = self._duels.get(victim_id)
-            self.logger.debug(
-                f"No killer found in actor event. victim_id={victim_id} opponent={opponent_id}"
-            )
+            opponent_id = self._opponent.get(victim_id)
+            if debug:
+                self.logger.debug(
+                    f"No killer found in actor event. victim_id={victim_id} opponent={opponent_id}"
+                )
             if opponent_id:
                 opponent = self.server.get_player(opponent_id)
                 if opponent:
@@ -586,11 +666,11 @@ class PvPArena(Plugin):
         """Handle a player leaving during a duel."""
         player = event.player
         leaver_id = player.unique_id
-        opp_id = self._duels.pop(leaver_id, None)
+        opp_id = self._opponent.pop(leaver_id, None)
         self._bars.pop(leaver_id, None)
         if not opp_id:
             return
-        self._duels.pop(opp_id, None)
+        self._opponent.pop(opp_id, None)
         opponent = self.server.get_player(opp_id)
         if opponent:
             self.logger.info(
@@ -601,6 +681,9 @@ class PvPArena(Plugin):
             self.logger.info(
                 f"Both duelists offline after {player.name} quit; cleaning up"
             )
+            self._active_duels.discard(frozenset((leaver_id, opp_id)))
+            if not self._active_duels:
+                self._set_keep_inventory(False)
 
     def _handle_player_join(self, player) -> None:
         """Restore inventory for players who disconnected mid-duel."""
@@ -625,7 +708,7 @@ class PvPArena(Plugin):
             return True
 
         if command.name == "forceend":
-            opp_id = self._duels.get(sender.unique_id)
+            opp_id = self._opponent.get(sender.unique_id)
             if not opp_id:
                 sender.send_tip("You are not in a duel")
                 return True